@@ -0,0 +1,78 @@
+"""
+HVAC Booking Agent - Service Type Classifier
+
+Deterministic keyword classifier for the service type of a booking.
+
+The service type is one of a handful of known values and is usually obvious
+from the customer's first sentence ("my AC isn't cooling" is an AC repair),
+so it can be filled in locally instead of waiting for the LLM to extract it.
+
+Author: Qian Sun
+Date: 2026-10-15
+Version: 1.0.0
+License: MIT License
+
+Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
+"""
+
+import re
+from typing import Dict, Final, Optional, Pattern, Tuple
+
+# Keywords per service type; "other" is left to the LLM
+_SERVICE_KEYWORDS: Final[Dict[str, Tuple[str, ...]]] = {
+    "ac_repair": (
+        "ac",
+        "a/c",
+        "air con",
+        "air conditioner",
+        "air conditioning",
+        "cooling",
+        "not cool",
+    ),
+    "furnace_maintenance": ("furnace", "heating", "heater", "no heat", "not heating"),
+    "installation": ("install", "installation", "installed", "replacement", "new unit"),
+    "cleaning": ("clean", "cleaning", "duct cleaning", "dirty", "dust"),
+    "ventilation_maintenance": (
+        "ventilation",
+        "vent",
+        "vents",
+        "hrv",
+        "erv",
+        "exhaust fan",
+        "airflow",
+        "air flow",
+    ),
+}
+
+# One whole-word pattern per service type, compiled once
+_SERVICE_PATTERNS: Final[Dict[str, Pattern[str]]] = {
+    service_type: re.compile(
+        r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE
+    )
+    for service_type, keywords in _SERVICE_KEYWORDS.items()
+}
+
+
+def classify_service_type(text: str) -> Optional[str]:
+    """
+    Classify the service type mentioned in a customer's answer
+
+    Args:
+        text: the customer's answer
+
+    Returns:
+        service type, or None when no type or more than one type matches
+        equally well
+    """
+    scores = sorted(
+        (
+            (len(pattern.findall(text)), service_type)
+            for service_type, pattern in _SERVICE_PATTERNS.items()
+        ),
+        reverse=True,
+    )
+    (best, service_type), (runner_up, _) = scores[0], scores[1]
+    # Only a clear winner counts; ambiguous answers are left to the LLM
+    if best == 0 or best == runner_up:
+        return None
+    return service_type
@@ -0,0 +1,72 @@
+"""
+HVAC Booking Agent - JSON Helpers
+
+JSON encoding and decoding backed by orjson, with a standard-library
+fallback for environments where the orjson wheel is not available.
+
+Both backends produce the same compact UTF-8 bytes, so cache keys and
+stored records do not depend on which one is installed.
+
+Author: Qian Sun
+Date: 2026-10-15
+Version: 1.0.0
+License: MIT License
+
+Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse a JSON document
+
+    Args:
+        data: JSON text as UTF-8 bytes or str
+
+    Returns:
+        parsed value
+
+    Raises:
+        ValueError: if the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False, append_newline: bool = False) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON
+
+    Args:
+        obj: value to serialize
+        sort_keys: whether to sort object keys, e.g. for stable hashes
+        append_newline: whether to end the output with a newline, e.g. for JSONL
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if append_newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    text = json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    )
+    if append_newline:
+        text += "\n"
+    return text.encode("utf-8")
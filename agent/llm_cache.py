@@ -0,0 +1,183 @@
+"""
+HVAC Booking Agent - LLM Response Cache
+
+SQLite-backed exact-match cache for OpenAI chat completion responses.
+
+Reruns, regression tests and users re-answering the same question send
+byte-for-byte identical requests. The cache keys each request by a SHA-256
+of its canonical form and returns the stored response instead of calling
+the API again.
+
+Author: Qian Sun
+Date: 2026-10-15
+Version: 1.0.0
+License: MIT License
+
+Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import unicodedata
+from typing import Any, Optional
+
+from . import jsonutil
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".hvac_agent", "cache.sqlite")
+
+# Least recently used entries are evicted beyond this size
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Entries older than this many seconds are treated as misses
+DEFAULT_TTL = 24 * 60 * 60
+
+# Request parameters that do not affect the response content
+_EXCLUDED_PARAMS = frozenset({"stream", "user", "api_key"})
+
+
+def _normalize(value: Any) -> Any:
+    """NFC-normalize every string in a JSON-like value"""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def make_cache_key(model: str, messages: Any, temperature: float, **params: Any) -> str:
+    """
+    Build the cache key of a chat completion request
+
+    Args:
+        model: name of the model
+        messages: list of messages
+        temperature: temperature parameter
+        **params: other request parameters, e.g. max_tokens or response_format;
+            None values and transport-only parameters are ignored
+
+    Returns:
+        hex SHA-256 of the canonical request
+    """
+    payload = {
+        "model": model.lower(),
+        "messages": _normalize(messages),
+        "temperature": temperature,
+    }
+    for name, value in params.items():
+        if name not in _EXCLUDED_PARAMS and value is not None:
+            payload[name] = _normalize(value)
+
+    return hashlib.sha256(jsonutil.dumps(payload, sort_keys=True)).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed LLM response cache"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """
+        Initialize LLM response cache
+
+        Args:
+            path: path of the SQLite database, created if missing
+            max_entries: maximum number of cached responses
+            ttl: lifetime of a cached response in seconds
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # ts is the last access time (for LRU eviction), created the insertion
+        # time (for expiry), both in nanoseconds
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, ts INTEGER NOT NULL, "
+            "created INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "created" not in columns:
+            # Databases from before expiry support; their entries count as expired
+            self._conn.execute(
+                "ALTER TABLE cache ADD COLUMN created INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response
+
+        Args:
+            key: cache key from `make_cache_key`
+
+        Returns:
+            cached response content, or None on a miss or an expired entry
+        """
+        row = self._conn.execute(
+            "SELECT value, created FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        now = time.time_ns()
+        value, created = row
+        if now - created > self.ttl * 1e9:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+            self.misses += 1
+            return None
+
+        # Refresh the entry so eviction is least-recently-used
+        self._conn.execute("UPDATE cache SET ts = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.hits += 1
+        return value.decode("utf-8")
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response, evicting the least recently used entries when full
+
+        Args:
+            key: cache key from `make_cache_key`
+            value: response content
+        """
+        now = time.time_ns()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, ts, created) "
+            "VALUES (?, ?, ?, ?)",
+            (key, value.encode("utf-8"), now, now),
+        )
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY ts LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the hit/miss counters"""
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
@@ -3,6 +3,10 @@ HVAC Booking Agent - LLM Client
 
 OpenAI LLM client for processing HVAC booking conversations.
 
+The CLI shares one process-wide client (`get_default_client`), so every
+request reuses the same connection pool instead of paying for a new TLS
+handshake.
+
 Author: Qian Sun
 Date: 2025-10-17
 Version: 1.0.0
@@ -12,37 +16,348 @@ Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
 """
 
 import os
-import json
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import logging
-from typing import List, Dict, Optional
+import time
+from collections import OrderedDict
+from io import StringIO
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    Literal,
+    Dict,
+    Final,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from pydantic import TypeAdapter, ValidationError
+from openai import (
+    NOT_GIVEN,
+    APIConnectionError,
+    AsyncOpenAI,
+    AuthenticationError,
+    BadRequestError,
+    DefaultAioHttpClient,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    PermissionDeniedError,
+    RateLimitError,
+)
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
     retry_if_exception_type,
 )
-from .schema import BookingIntent, AgentOutput
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+from . import jsonutil
+from .llm_cache import LLMCache, make_cache_key
+from .schema import AGENT_OUTPUT_SCHEMA, TURN_RESPONSE_SCHEMA, AgentOutput
+from .semantic_cache import SemanticCache
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Library code only creates its logger; handlers and levels are configured by
+# the application (see cli.py)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Kind of work a request performs; decides which model serves it
+Task = Literal["extract", "validate", "followup", "summarize"]
+
+# Small text-in/text-out tasks that the light model handles equally well
+LIGHT_TASKS = frozenset({"validate", "followup", "summarize"})
+
+# Default number of conversations processed concurrently by
+# process_conversations_batch; tune towards the account's RPM ceiling
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("HVAC_LLM_CONCURRENCY", "8"))
+
+# OpenAI Batch API settings
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Fixed probe sent by test_connection
+_CONNECTION_TEST_MESSAGES: Final[List[Dict[str, str]]] = [
+    {"role": "user", "content": "Hello, this is a connection test."}
+]
+
+# Successful connection tests are remembered here, so CLI runs started
+# shortly after one another skip the probe
+CONNECTION_CHECK_PATH = os.path.join(
+    os.path.expanduser("~"), ".hvac_agent", "conn_ok.json"
+)
+CONNECTION_CHECK_TTL = 600  # seconds
+
+# Failures that mean a remembered connection test no longer holds
+_CONNECTION_ERRORS = (AuthenticationError, PermissionDeniedError, APIConnectionError)
+
+# Validates a whole batch of parsed responses in one call
+_BATCH_VALIDATOR = TypeAdapter(Dict[str, AgentOutput])
+
+# Embedding model used for semantic cache lookups
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Maximum number of responses kept by the exact-match cache
+RESPONSE_CACHE_SIZE = 1024
+
+# Output cap for extraction calls; the schema-constrained AgentOutput fits well
+# within it. Tune using the completion token counts logged per call.
+EXTRACTION_MAX_TOKENS = 400
+
+# Conversations longer than this many tokens have their older turns replaced
+# by a summary, so the input of a call stops growing with the conversation
+HISTORY_TOKEN_BUDGET = 2000
+
+# Number of most recent turns that are always sent verbatim
+HISTORY_RECENT_TURNS = 3
+
+# Output cap for the summary of the older turns
+SUMMARY_MAX_TOKENS = 300
+
+# Rough characters per token, used to estimate token counts without tiktoken
+_CHARS_PER_TOKEN = 4
+
+_SUMMARY_PROMPT: Final[str] = (
+    "Summarize the following turns of an HVAC service booking conversation. "
+    "Keep every detail the customer gave (service needed, problem, contact, "
+    "property, address, timing, access notes, equipment and constraints) and "
+    "any corrections they made; drop greetings and small talk. Reply with the "
+    "summary only."
+)
+
+# Structured-output format that constrains responses to the AgentOutput schema
+AGENT_OUTPUT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "AgentOutput",
+        "schema": AGENT_OUTPUT_SCHEMA,
+        "strict": True,
+    },
+}
+
+# Structured-output format that constrains responses to the TurnResponse schema
+TURN_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "TurnResponse",
+        "schema": TURN_RESPONSE_SCHEMA,
+        "strict": True,
+    },
+}
+
+
+# JSON mode, used instead of a json_schema format for models without
+# structured outputs; responses are still validated by the caller
+JSON_OBJECT_RESPONSE_FORMAT: Final[Dict[str, str]] = {"type": "json_object"}
+
+
+def _response_format_digest(response_format: Dict) -> str:
+    """SHA-256 of a response_format, used in persistent cache keys"""
+    return hashlib.sha256(
+        jsonutil.dumps(response_format, sort_keys=True)
+    ).hexdigest()
+
+
+# Digests of the module's response formats, keyed by id() since dicts are not
+# hashable. The constants live as long as the module, so their ids are stable
+# and the multi-kilobyte schemas are serialized once instead of per request.
+_RESPONSE_FORMAT_DIGESTS: Final[Dict[int, str]] = {
+    id(response_format): _response_format_digest(response_format)
+    for response_format in (AGENT_OUTPUT_RESPONSE_FORMAT, TURN_RESPONSE_FORMAT)
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_digest(system_prompt: str) -> str:
+    """
+    SHA-256 of a system prompt, computed once per distinct prompt
+
+    System prompts are module-level constants, so the same few strings are
+    hashed on every call; the str object caches its own hash, which makes
+    the lookup cheap compared with re-hashing several kilobytes.
+    """
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding_for(model: str):
+    """tiktoken encoding of a model, or None when tiktoken is not installed"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Models newer than the installed tiktoken use the current encoding
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(texts: List[str], model: str) -> int:
+    """
+    Count the tokens of some texts for a model
+
+    Args:
+        texts: texts to count
+        model: name of the model whose tokenizer is used
+
+    Returns:
+        number of tokens, estimated from the length when tiktoken is not
+        installed
+    """
+    encoding = _encoding_for(model)
+    if encoding is None:
+        return sum(len(text) for text in texts) // _CHARS_PER_TOKEN
+    return sum(len(encoding.encode(text)) for text in texts)
+
+
+def _load_connection_checks() -> Dict[str, float]:
+    """Load the times of remembered successful connection tests"""
+    try:
+        with open(CONNECTION_CHECK_PATH, "rb") as f:
+            checks = jsonutil.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return checks if isinstance(checks, dict) else {}
+
+
+def _remember_connection_ok(key: str) -> None:
+    """Record a successful connection test, dropping expired records"""
+    now = time.time()
+    checks = {
+        k: checked_at
+        for k, checked_at in _load_connection_checks().items()
+        if now - checked_at < CONNECTION_CHECK_TTL
+    }
+    checks[key] = now
+    try:
+        os.makedirs(os.path.dirname(CONNECTION_CHECK_PATH), exist_ok=True)
+        with open(CONNECTION_CHECK_PATH, "wb") as f:
+            f.write(jsonutil.dumps(checks))
+    except OSError as e:
+        logger.warning("Could not record connection test: %s", e)
+
+
+def _forget_connection_checks() -> None:
+    """Drop all remembered connection tests after an auth or network failure"""
+    try:
+        os.remove(CONNECTION_CHECK_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not reset connection tests: %s", e)
+
+
+# Connection pool of the HTTP transport. Idle connections are kept well past
+# the SDK default of 5 s, since a user usually takes longer than that to
+# answer and the next turn would otherwise open a new connection.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=10, keepalive_expiry=120.0
+)
+
+# HTTP/2 needs the optional h2 package (`httpx[http2]`)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Transient failures worth retrying: network errors and timeouts
+# (APITimeoutError subclasses APIConnectionError), rate limits and 5xx
+RETRYABLE_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    APIConnectionError,
+    RateLimitError,
+    InternalServerError,
+)
+
+_wait_backoff = wait_random_exponential(multiplier=1, max=30)
+
+
+def _wait_with_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Compute the delay before the next retry
+
+    Uses jittered exponential backoff, but never waits less than the
+    Retry-After header of a rate-limited or overloaded response asks for.
+    """
+    backoff = _wait_backoff(retry_state)
+
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(error, "response", None)
+    if response is None:
+        return backoff
+
+    try:
+        retry_after = float(response.headers.get("retry-after", ""))
+    except ValueError:
+        # Missing, or an HTTP date rather than seconds
+        return backoff
+    return max(retry_after, backoff)
+
+
+_retry_transient_errors = retry(
+    stop=stop_after_attempt(5),
+    wait=_wait_with_retry_after,
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    reraise=True,
+)
+
+
+def _build_http_client():
+    """
+    Build the HTTP transport for AsyncOpenAI
+
+    The aiohttp transport scales much better than httpx under concurrent
+    requests. It needs the `openai[aiohttp]` extra, so fall back to the
+    default httpx transport when it is not installed; that one multiplexes
+    concurrent requests over one HTTP/2 connection when h2 is installed.
+    """
+    try:
+        return DefaultAioHttpClient(limits=HTTP_LIMITS)
+    except RuntimeError:
+        logger.warning(
+            "openai[aiohttp] is not installed, falling back to the httpx transport"
+        )
+        return DefaultAsyncHttpxClient(limits=HTTP_LIMITS, http2=_HTTP2_AVAILABLE)
+
 
 class LLMClient:
     """OpenAI LLM client"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4",
+        semantic_cache: Optional[SemanticCache] = None,
+        model_light: str = "gpt-4o-mini",
+        cache: Optional[LLMCache] = None,
+    ):
         """
         Initialize LLM client
 
         Args:
             api_key: OpenAI API key, if not provided, read from environment variable
-            model: name of the model to use
+            model: name of the model to use; serves the fused extract-and-ask
+                calls, where schema adherence matters most
+            model_light: smaller, faster model for validation, follow-up and
+                summaries
+            semantic_cache: optional semantic cache consulted by
+                process_conversation for deterministic (temperature 0) calls
+            cache: optional persistent exact-match cache consulted by every
+                chat completion call
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -51,19 +366,168 @@ class LLMClient:
             )
 
         self.model = model
-        self.client = OpenAI(api_key=self.api_key)
+        self.model_light = model_light
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self._response_cache: "OrderedDict[Tuple[str, str, str, float], str]" = (
+            OrderedDict()
+        )
+        # Models that rejected a json_schema response format
+        self._json_mode_models: Set[str] = set()
+        # Retries are handled by _retry_transient_errors; disable the SDK's
+        # own retries so the two policies do not multiply
+        self.client = AsyncOpenAI(
+            api_key=self.api_key, http_client=_build_http_client(), max_retries=0
+        )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError)),
-    )
-    def _chat_completion(
+        # Event loop used by the synchronous shims. The underlying HTTP session
+        # is bound to the loop it was opened on, so sync callers share one loop
+        # for the lifetime of the client instead of calling asyncio.run per call.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _run_sync(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine to completion for synchronous (legacy) callers
+
+        Args:
+            coro: coroutine to run
+
+        Returns:
+            result of the coroutine
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP session"""
+        await self.client.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session from synchronous code"""
+        if self._loop is None or self._loop.is_closed():
+            # The session was never used from the sync shims
+            asyncio.run(self.aclose())
+            return
+
+        self._run_sync(self.aclose())
+        self._loop.close()
+
+    def _cache_key(
+        self,
+        use_cache: bool,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        response_format: Optional[Dict],
+    ) -> Optional[str]:
+        """Persistent cache key of a request, or None if the cache is not used"""
+        if not use_cache or self.cache is None:
+            return None
+
+        format_digest = None
+        if response_format is not None:
+            format_digest = _RESPONSE_FORMAT_DIGESTS.get(id(response_format))
+            if format_digest is None:
+                format_digest = _response_format_digest(response_format)
+
+        return make_cache_key(
+            model,
+            messages,
+            temperature,
+            max_tokens=max_tokens,
+            response_format=format_digest,
+        )
+
+    async def _create_completion(
+        self, model: str, response_format: Optional[Dict], **params
+    ):
+        """
+        Send a chat completion request, using JSON mode for models without
+        structured outputs
+
+        A json_schema format that the model rejects is replaced by JSON mode
+        and the request is sent again; the model is remembered, so later
+        requests go out in JSON mode directly instead of failing first.
+
+        Args:
+            model: model to use
+            response_format: optional response format, e.g. a JSON schema
+            **params: other request parameters
+
+        Returns:
+            the API response, or the stream of chunks when streaming
+        """
+        is_json_schema = (
+            response_format is not None and response_format.get("type") == "json_schema"
+        )
+        if is_json_schema and model in self._json_mode_models:
+            response_format = JSON_OBJECT_RESPONSE_FORMAT
+
+        try:
+            return await self.client.chat.completions.create(
+                model=model, response_format=response_format or NOT_GIVEN, **params
+            )
+        except BadRequestError as e:
+            if not is_json_schema or model in self._json_mode_models:
+                raise
+            if "response_format" not in str(e):
+                raise
+            logger.warning(
+                "Model %s does not support structured outputs, using JSON mode", model
+            )
+            self._json_mode_models.add(model)
+            return await self.client.chat.completions.create(
+                model=model, response_format=JSON_OBJECT_RESPONSE_FORMAT, **params
+            )
+
+    def _cache_lookup(
+        self, cache_key: str, validate: Optional[Callable[[str], T]]
+    ) -> Optional[Tuple[str, Union[str, T]]]:
+        """
+        Look up a response in the persistent cache
+
+        Args:
+            cache_key: key from `_cache_key`
+            validate: optional validator of the content, see `_chat_completion`
+
+        Returns:
+            the cached content and the result of `validate` on it (the content
+            itself without a validator), or None on a miss or when the cached
+            content fails validation
+        """
+        cached_content = self.cache.get(cache_key)
+        logger.info(
+            "LLM cache %s (hits=%d, misses=%d)",
+            "miss" if cached_content is None else "hit",
+            self.cache.hits,
+            self.cache.misses,
+        )
+        if cached_content is None:
+            return None
+        if validate is None:
+            return cached_content, cached_content
+
+        try:
+            return cached_content, validate(cached_content)
+        except Exception as e:
+            # Stored before responses were validated; fetch a new one
+            logger.warning("Ignoring invalid cached response: %s", e)
+            return None
+
+    @_retry_transient_errors
+    async def _chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.1,
         max_tokens: Optional[int] = None,
-    ) -> str:
+        response_format: Optional[Dict] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        quiet: bool = False,
+        validate: Optional[Callable[[str], T]] = None,
+    ) -> Union[str, T]:
         """
         Call OpenAI chat completion API (internal method)
 
@@ -71,15 +535,32 @@ class LLMClient:
             messages: list of messages
             temperature: temperature parameter, controls the randomness of the output
             max_tokens: maximum number of tokens
+            response_format: optional response format, e.g. a JSON schema
+            model: model to use instead of the client's default model
+            use_cache: whether to consult the persistent response cache
+            quiet: log failures at debug level, for callers that report them
+            validate: parses and checks the content before it is cached, e.g.
+                a schema validator; content it rejects by raising is neither
+                cached nor served from the cache, and the error propagates
 
         Returns:
-            content of the API response
+            content of the API response, or the result of `validate` on it
         """
+        model = model or self.model
+        cache_key = self._cache_key(
+            use_cache, model, messages, temperature, max_tokens, response_format
+        )
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key, validate)
+            if cached is not None:
+                return cached[1]
+
         try:
-            logger.info(f"Calling OpenAI API with model: {self.model}")
+            logger.info("Calling OpenAI API with model: %s", model)
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
+                model,
+                response_format,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
@@ -87,17 +568,321 @@ class LLMClient:
 
             content = response.choices[0].message.content
             logger.info("OpenAI API call successful")
-            return content
+            if response.usage is not None:
+                logger.info(
+                    "Token usage: prompt=%s, completion=%s",
+                    response.usage.prompt_tokens,
+                    response.usage.completion_tokens,
+                )
+
+        except Exception as e:
+            logger.log(
+                logging.DEBUG if quiet else logging.ERROR,
+                "OpenAI API call failed: %s",
+                e,
+            )
+            if isinstance(e, _CONNECTION_ERRORS):
+                _forget_connection_checks()
+            raise
+
+        # Only content that passes validation is cached, so a truncated or
+        # malformed response is not served again for the next 24 hours
+        result = content if validate is None else validate(content)
+        if cache_key is not None and content is not None:
+            self.cache.set(cache_key, content)
+        return result
+
+    @_retry_transient_errors
+    async def _open_stream(
+        self, model: str, response_format: Optional[Dict], **params
+    ):
+        """
+        Open a streaming chat completion, retrying transient failures
+
+        Only opening the stream is retried: once deltas have been passed to
+        the caller, a retry would replay them on top of the partial output.
+
+        Args:
+            model: model to use
+            response_format: optional response format, e.g. a JSON schema
+            **params: other request parameters
+
+        Returns:
+            the stream of chunks
+        """
+        return await self._create_completion(
+            model,
+            response_format,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params,
+        )
+
+    async def _chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        on_token: Callable[[str], None],
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict] = None,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+        validate: Optional[Callable[[str], T]] = None,
+    ) -> Union[str, T]:
+        """
+        Call OpenAI chat completion API in streaming mode (internal method)
+
+        Args:
+            messages: list of messages
+            on_token: called with each content delta as it arrives, e.g. to
+                push partial output to a UI
+            temperature: temperature parameter, controls the randomness of the output
+            max_tokens: maximum number of tokens
+            response_format: optional response format, e.g. a JSON schema
+            model: model to use instead of the client's default model
+            use_cache: whether to consult the persistent response cache
+            validate: parses and checks the full content before it is
+                cached, e.g. a schema validator; content it rejects by raising
+                is neither cached nor served from the cache, and the error
+                propagates
+
+        Returns:
+            full content of the API response, or the result of `validate` on it
+        """
+        model = model or self.model
+        cache_key = self._cache_key(
+            use_cache, model, messages, temperature, max_tokens, response_format
+        )
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key, validate)
+            if cached is not None:
+                cached_content, result = cached
+                on_token(cached_content)
+                return result
+
+        try:
+            logger.info("Calling OpenAI API (streaming) with model: %s", model)
+
+            stream = await self._open_stream(
+                model,
+                response_format,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
+            buffer = StringIO()
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    logger.info(
+                        "Token usage: prompt=%s, completion=%s",
+                        chunk.usage.prompt_tokens,
+                        chunk.usage.completion_tokens,
+                    )
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    buffer.write(delta)
+                    on_token(delta)
+
+            logger.info("OpenAI API streaming call successful")
+            content = buffer.getvalue()
 
         except Exception as e:
-            logger.error(f"OpenAI API call failed: {str(e)}")
+            logger.error("OpenAI API streaming call failed: %s", e)
+            if isinstance(e, _CONNECTION_ERRORS):
+                _forget_connection_checks()
             raise
 
-    def process_conversation(
+        # Only content that passes validation is cached, so a truncated or
+        # malformed response is not served again for the next 24 hours
+        result = content if validate is None else validate(content)
+        if cache_key is not None:
+            self.cache.set(cache_key, content)
+        return result
+
+    def _chat_completion_sync(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """Synchronous shim around `_chat_completion` for legacy callers"""
+        return self._run_sync(
+            self._chat_completion(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                model=model,
+            )
+        )
+
+    def _chat_completion_stream_sync(
+        self,
+        messages: List[Dict[str, str]],
+        on_token: Callable[[str], None],
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        """Synchronous shim around `_chat_completion_stream` for legacy callers"""
+        return self._run_sync(
+            self._chat_completion_stream(
+                messages,
+                on_token,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                model=model,
+            )
+        )
+
+    @staticmethod
+    def _build_messages(
+        conversation_turns: List[str], system_prompt: str
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a conversation
+
+        Each turn is sent as its own user message after the system prompt, so
+        a follow-up request for the same conversation shares a byte-identical
+        prefix with the previous one and hits OpenAI's prompt cache. Turns are
+        not re-numbered or re-joined, which would shift every offset.
+
+        Args:
+            conversation_turns: list of conversation turns
+            system_prompt: system prompt
+
+        Returns:
+            list of messages
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend({"role": "user", "content": turn} for turn in conversation_turns)
+        return messages
+
+    async def _compact_history(
+        self, conversation_turns: List[str], system_prompt: str
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages, summarizing older turns of a long conversation
+
+        Once the turns exceed HISTORY_TOKEN_BUDGET tokens, all but the last
+        HISTORY_RECENT_TURNS are replaced by a single system note holding
+        their summary, so the input of a call stays bounded however long the
+        conversation gets.
+
+        Args:
+            conversation_turns: list of conversation turns
+            system_prompt: system prompt
+
+        Returns:
+            list of messages
+        """
+        older = conversation_turns[:-HISTORY_RECENT_TURNS]
+        if not older or count_tokens(
+            conversation_turns, self.model
+        ) <= HISTORY_TOKEN_BUDGET:
+            return self._build_messages(conversation_turns, system_prompt)
+
+        # Deterministic, so the summary of the same prefix comes from the cache
+        summary = await self._chat_completion(
+            [
+                {"role": "system", "content": _SUMMARY_PROMPT},
+                {"role": "user", "content": "\n".join(older)},
+            ],
+            temperature=0.0,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            model=self.model_for("summarize"),
+        )
+        logger.info("Summarized %d older conversation turns", len(older))
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": f"Earlier context: {summary}"},
+        ]
+        messages.extend(
+            {"role": "user", "content": turn}
+            for turn in conversation_turns[-HISTORY_RECENT_TURNS:]
+        )
+        return messages
+
+    @staticmethod
+    def _parse_agent_output(response_content: str) -> AgentOutput:
+        """
+        Parse an API response into AgentOutput
+
+        Responses are requested with AGENT_OUTPUT_RESPONSE_FORMAT, so the API
+        guarantees schema-conforming JSON and Pydantic validation is the only
+        gate; anything else is a hard error.
+
+        Args:
+            response_content: content of the API response
+
+        Returns:
+            AgentOutput object
+        """
+        return AgentOutput.model_validate(
+            LLMClient._agent_output_data(jsonutil.loads(response_content))
+        )
+
+    @staticmethod
+    def _parse_with_content(response_content: str) -> Tuple[str, AgentOutput]:
+        """Parse an API response, keeping its content for the response caches"""
+        return response_content, LLMClient._parse_agent_output(response_content)
+
+    @staticmethod
+    def _agent_output_data(response_data: Dict) -> Dict:
+        """Pick the AgentOutput fields out of a parsed response"""
+        return {
+            "summary": response_data.get("summary", ""),
+            "booking": response_data.get("booking", {}),
+        }
+
+    def model_for(self, task: Task) -> str:
+        """
+        Pick the model for a kind of request
+
+        Args:
+            task: kind of work the request performs
+
+        Returns:
+            name of the model to use
+        """
+        return self.model_light if task in LIGHT_TASKS else self.model
+
+    async def _embed(self, text: str) -> List[float]:
+        """
+        Embed text for semantic cache lookups (internal method)
+
+        Args:
+            text: text to embed
+
+        Returns:
+            embedding vector
+        """
+        response = await self.client.embeddings.create(
+            model=EMBEDDING_MODEL, input=text
+        )
+        return response.data[0].embedding
+
+    def clear_cache(self) -> None:
+        """Clear the exact-match response cache and the semantic cache"""
+        self._response_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+
+    async def process_conversation(
         self,
         conversation_turns: List[str],
         system_prompt: str,
         temperature: float = 0.1,
+        on_token: Optional[Callable[[str], None]] = None,
+        task: Task = "extract",
     ) -> AgentOutput:
         """
         Process complete conversation and return structured output
@@ -106,85 +891,411 @@ class LLMClient:
             conversation_turns: list of conversation turns
             system_prompt: system prompt
             temperature: temperature parameter
+            on_token: if provided, stream the response and call this with each
+                content delta; cached responses are passed in one piece
+            task: kind of work the prompt performs; validation and follow-up
+                are routed to the light model
 
         Returns:
             AgentOutput object, containing summary and booking information
         """
-        # Build messages directly
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": "\n".join(
-                    [
-                        f"Turn {i + 1}: {turn}"
-                        for i, turn in enumerate(conversation_turns)
-                    ]
-                ),
-            },
-        ]
+        model = self.model_for(task)
 
         try:
-            # Call API
-            response_content = self._chat_completion(messages, temperature=temperature)
+            # Only deterministic outputs are safe to serve from the caches
+            cacheable = temperature == 0.0
+            if cacheable:
+                # Exact match first: free, and catches retried or repeated requests
+                cache_key = (
+                    model,
+                    _prompt_digest(system_prompt),
+                    hashlib.sha1(jsonutil.dumps(conversation_turns)).hexdigest(),
+                    temperature,
+                )
+                cached_content = self._response_cache.get(cache_key)
+                if cached_content is not None:
+                    self._response_cache.move_to_end(cache_key)
+                    logger.info("Response cache hit")
+                    if on_token is not None:
+                        on_token(cached_content)
+                    return self._parse_agent_output(cached_content)
 
-            # Parse JSON response
-            try:
-                response_data = json.loads(response_content)
+            use_semantic_cache = cacheable and self.semantic_cache is not None
+            if use_semantic_cache:
+                namespace = f"{model}:{_prompt_digest(system_prompt)}"
+                embedding = await self._embed("\n".join(conversation_turns))
+                response_content = self.semantic_cache.lookup(namespace, embedding)
+                if response_content is not None:
+                    logger.info("Semantic cache hit")
+                    if on_token is not None:
+                        on_token(response_content)
+            else:
+                response_content = None
 
-                # Validate and create AgentOutput
-                agent_output = AgentOutput(
-                    summary=response_data.get("summary", ""),
-                    booking=BookingIntent(**response_data.get("booking", {})),
+            if response_content is None:
+                # Call API. The response is parsed before any cache stores
+                # it, so a truncated one raises here instead of being served
+                # to every later call for this conversation.
+                messages = await self._compact_history(
+                    conversation_turns, system_prompt
                 )
+                if on_token is not None:
+                    response_content, output = await self._chat_completion_stream(
+                        messages,
+                        on_token,
+                        temperature=temperature,
+                        max_tokens=EXTRACTION_MAX_TOKENS,
+                        response_format=AGENT_OUTPUT_RESPONSE_FORMAT,
+                        model=model,
+                        validate=self._parse_with_content,
+                    )
+                else:
+                    response_content, output = await self._chat_completion(
+                        messages,
+                        temperature=temperature,
+                        max_tokens=EXTRACTION_MAX_TOKENS,
+                        response_format=AGENT_OUTPUT_RESPONSE_FORMAT,
+                        model=model,
+                        validate=self._parse_with_content,
+                    )
 
-                return agent_output
+                if use_semantic_cache:
+                    self.semantic_cache.store(namespace, embedding, response_content)
+            else:
+                output = self._parse_agent_output(response_content)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {str(e)}")
-                logger.error(f"Raw response: {response_content}")
+            if cacheable:
+                self._response_cache[cache_key] = response_content
+                if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
 
-                # Return error format AgentOutput
-                return AgentOutput(
-                    summary="Error: Failed to parse API response",
-                    booking=BookingIntent(service_type="other", confidence=0.0),
-                )
+            return output
 
         except Exception as e:
-            logger.error(f"Error processing conversation: {str(e)}")
+            logger.error("Error processing conversation: %s", e)
             raise
 
-    def test_connection(self) -> bool:
+    async def process_conversations_batch(
+        self,
+        list_of_turns: List[List[str]],
+        system_prompt: str,
+        max_concurrency: Optional[int] = None,
+        temperature: float = 0.1,
+        task: Task = "extract",
+    ) -> List[Union[AgentOutput, BaseException]]:
+        """
+        Process several conversations concurrently
+
+        Args:
+            list_of_turns: one list of conversation turns per conversation
+            system_prompt: system prompt shared by all conversations
+            max_concurrency: maximum number of in-flight requests, defaults to
+                the HVAC_LLM_CONCURRENCY environment variable (8)
+            temperature: temperature parameter
+            task: kind of work the prompt performs
+
+        Returns:
+            one AgentOutput per conversation, in input order; a failed
+            conversation yields its exception instead
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or DEFAULT_MAX_CONCURRENCY)
+
+        async def _one(conversation_turns: List[str]) -> AgentOutput:
+            async with semaphore:
+                return await self.process_conversation(
+                    conversation_turns,
+                    system_prompt,
+                    temperature=temperature,
+                    task=task,
+                )
+
+        return await asyncio.gather(
+            *(_one(turns) for turns in list_of_turns), return_exceptions=True
+        )
+
+    async def submit_batch(
+        self,
+        conversations: List[List[str]],
+        system_prompt: str,
+        temperature: float = 0.1,
+    ) -> str:
+        """
+        Submit conversations to the OpenAI Batch API for offline processing
+
+        Batch requests cost about half as much as real-time calls but may take
+        up to 24 hours, so this is meant for archived transcripts and evals.
+
+        Args:
+            conversations: one list of conversation turns per conversation
+            system_prompt: system prompt shared by all conversations
+            temperature: temperature parameter
+
+        Returns:
+            id of the created batch
+        """
+        lines = []
+        for idx, conversation_turns in enumerate(conversations):
+            request = {
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(conversation_turns, system_prompt),
+                    "temperature": temperature,
+                    "max_tokens": EXTRACTION_MAX_TOKENS,
+                    "response_format": AGENT_OUTPUT_RESPONSE_FORMAT,
+                },
+            }
+            lines.append(jsonutil.dumps(request, append_newline=True))
+
+        batch_file = await self.client.files.create(
+            file=("hvac_batch.jsonl", b"".join(lines)),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d conversations", batch.id, len(lines))
+        return batch.id
+
+    async def fetch_batch(
+        self, batch_id: str, poll_interval: Optional[float] = None
+    ) -> Optional[Dict[str, AgentOutput]]:
+        """
+        Fetch the results of a batch created by `submit_batch`
+
+        Args:
+            batch_id: id returned by `submit_batch`
+            poll_interval: seconds between status checks; if not provided,
+                return None immediately when the batch is still running
+
+        Returns:
+            AgentOutput per conversation keyed by its index (as a string), or
+            None if the batch has not finished yet. Conversations whose request
+            failed or whose output is not a valid AgentOutput are logged and
+            left out.
+        """
+        batch = await self.client.batches.retrieve(batch_id)
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            if poll_interval is None:
+                return None
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch_id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ended with status: {batch.status}")
+
+        if not batch.output_file_id:
+            return {}
+
+        parsed: Dict[str, Dict] = {}
+        output = await self.client.files.content(batch.output_file_id)
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+
+            record = jsonutil.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.error(
+                    "Batch request %s failed: %s",
+                    record.get("custom_id"),
+                    record.get("error") or response.get("body"),
+                )
+                continue
+
+            content = response["body"]["choices"][0]["message"]["content"]
+            try:
+                response_data = jsonutil.loads(content)
+            except (TypeError, ValueError) as e:
+                # Truncated or refused completions; keep the rest of the batch
+                logger.error(
+                    "Batch request %s returned unparseable output: %s",
+                    record.get("custom_id"),
+                    e,
+                )
+                continue
+            if not isinstance(response_data, dict):
+                logger.error(
+                    "Batch request %s returned a non-object output",
+                    record.get("custom_id"),
+                )
+                continue
+            parsed[record["custom_id"]] = self._agent_output_data(response_data)
+
+        try:
+            return _BATCH_VALIDATOR.validate_python(parsed)
+        except ValidationError as e:
+            # Errors are located by custom_id; drop those conversations and
+            # validate the others again in one call
+            for custom_id in {error["loc"][0] for error in e.errors()}:
+                logger.error(
+                    "Batch request %s returned invalid output: %s",
+                    custom_id,
+                    parsed.pop(custom_id),
+                )
+            return _BATCH_VALIDATOR.validate_python(parsed)
+
+    def process_conversation_sync(
+        self,
+        conversation_turns: List[str],
+        system_prompt: str,
+        temperature: float = 0.1,
+        on_token: Optional[Callable[[str], None]] = None,
+        task: Task = "extract",
+    ) -> AgentOutput:
+        """Synchronous shim around `process_conversation` for legacy callers"""
+        return self._run_sync(
+            self.process_conversation(
+                conversation_turns,
+                system_prompt,
+                temperature=temperature,
+                on_token=on_token,
+                task=task,
+            )
+        )
+
+    async def test_connection(self, quiet: bool = False) -> bool:
         """
         Test API connection
 
+        Args:
+            quiet: log failures at debug level, e.g. when the test runs in the
+                background and the caller reports the result
+
         Returns:
             True if connection is successful, False otherwise
         """
         try:
-            test_messages = [
-                {"role": "user", "content": "Hello, this is a connection test."}
-            ]
-
-            self._chat_completion(test_messages, temperature=0.1, max_tokens=10)
+            # A single output token is enough to prove the call succeeds
+            await self._chat_completion(
+                _CONNECTION_TEST_MESSAGES,
+                temperature=0.1,
+                max_tokens=1,
+                use_cache=False,
+                quiet=quiet,
+            )
             logger.info("API connection test successful")
             return True
 
         except Exception as e:
-            logger.error(f"API connection test failed: {str(e)}")
+            logger.log(
+                logging.DEBUG if quiet else logging.ERROR,
+                "API connection test failed: %s",
+                e,
+            )
             return False
 
+    async def check_connection(
+        self, max_age: float = CONNECTION_CHECK_TTL, quiet: bool = False
+    ) -> bool:
+        """
+        Test API connection, unless a test with the same API key and model
+        succeeded within `max_age` seconds
+
+        Args:
+            max_age: how long a successful test is trusted, in seconds
+            quiet: log failures at debug level, see `test_connection`
+
+        Returns:
+            True if connection is successful, False otherwise
+        """
+        key = hashlib.sha256(
+            f"{self.client.api_key}:{self.model}".encode("utf-8")
+        ).hexdigest()
+        checked_at = _load_connection_checks().get(key)
+        if checked_at is not None and time.time() - checked_at < max_age:
+            logger.info("Skipping API connection test, last success is recent")
+            return True
+
+        connected = await self.test_connection(quiet=quiet)
+        if connected:
+            _remember_connection_ok(key)
+        return connected
+
+    def test_connection_sync(self) -> bool:
+        """Synchronous shim around `test_connection` for legacy callers"""
+        return self._run_sync(self.test_connection())
+
 
 # Convenience function
-def create_llm_client(api_key: Optional[str] = None, model: str = "gpt-4") -> LLMClient:
+def create_llm_client(
+    api_key: Optional[str] = None,
+    model: str = "gpt-4",
+    semantic_cache: Optional[SemanticCache] = None,
+    model_light: str = "gpt-4o-mini",
+    cache: Optional[LLMCache] = None,
+) -> LLMClient:
     """
     Convenience function to create LLM client
 
     Args:
         api_key: OpenAI API key
         model: name of the model to use
+        semantic_cache: optional semantic response cache
+        model_light: smaller model for validation and follow-up requests
+        cache: optional persistent response cache
 
     Returns:
         LLMClient instance
     """
-    return LLMClient(api_key=api_key, model=model)
+    return LLMClient(
+        api_key=api_key,
+        model=model,
+        semantic_cache=semantic_cache,
+        model_light=model_light,
+        cache=cache,
+    )
+
+
+# Process-wide client, see get_default_client
+_default_client: Optional[LLMClient] = None
+
+
+def get_default_client(
+    api_key: Optional[str] = None,
+    model: str = "gpt-4",
+    cache: Optional[LLMCache] = None,
+) -> LLMClient:
+    """
+    Get the process-wide LLM client, creating it on first use
+
+    Reusing one client keeps one HTTP session and connection pool alive, so
+    only the first request pays for connection setup and the TLS handshake.
+    The arguments are only used when the client is created. Since every
+    caller shares the pool, bound concurrency at the semaphore level
+    (HVAC_LLM_CONCURRENCY) rather than opening extra clients. In a web app,
+    create the client at startup and call `aclose_default_client` from the
+    shutdown (lifespan) hook.
+
+    Args:
+        api_key: OpenAI API key
+        model: name of the model to use
+        cache: optional persistent response cache
+
+    Returns:
+        shared LLMClient instance
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient(api_key=api_key, model=model, cache=cache)
+    return _default_client
+
+
+async def aclose_default_client() -> None:
+    """Close the process-wide LLM client, if it was created"""
+    global _default_client
+    client, _default_client = _default_client, None
+    if client is not None:
+        await client.aclose()
+
+
+def close_default_client() -> None:
+    """Close the process-wide LLM client from synchronous code"""
+    global _default_client
+    client, _default_client = _default_client, None
+    if client is not None:
+        client.close()
@@ -12,13 +12,30 @@ License: MIT License
 Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
 """
 
+from typing import Any, Dict, Final, List
+
+from . import jsonutil
+
 
 # =============================================================================
 # LLM SYSTEM PROMPTS
 # =============================================================================
-def get_guidance_prompt() -> str:
-    """Get prompt for determining conversation guidance strategy"""
-    return """You are a professional HVAC booking agent. You must follow a STRICT PRIORITY ORDER when collecting information. NEVER ask for multiple priority levels in the same question.
+# Prompts are module-level constants so every call returns the same string
+# object instead of re-materializing a multi-kilobyte literal.
+_EXTRACT_AND_ASK_PROMPT: Final[str] = """You are a professional HVAC booking agent. On every turn you do two things in ONE response: extract the booking information from the conversation, then choose the single next question to ask. You must follow a STRICT PRIORITY ORDER when collecting information. NEVER ask for multiple priority levels in the same question.
+
+EXTRACTION:
+Extract the information given in the user's LATEST ANSWER to your LAST QUESTION. Return only the fields that the latest answer adds or corrects, and null or [] for every other field: the information already collected is kept for you. Look for:
+- Service type (ac_repair, furnace_maintenance, installation, cleaning, ventilation_maintenance, other)
+- Problem summary
+- Contact information (name, phone, email)
+- Severity level (critical, high, medium, low)
+- Property type (apartment, detached_house, townhouse, commercial, other)
+- Address details (address, city, province, postal_code)
+- Preferred time slots
+- Access notes and constraints [OPTIONAL]
+- Equipment brand if mentioned [OPTIONAL]
+- Confidence score (0.0-1.0)
 
 INFORMATION COLLECTION PRIORITY (MUST FOLLOW THIS ORDER):
 1. **CRITICAL** (Ask first, one at a time):
@@ -47,97 +64,87 @@ CRITICAL RULES:
 - ALWAYS ask for ONE piece of information at a time
 - ONLY move to the next priority level when the current level is complete
 - For LOW priority items, always mention they can skip by saying "skip" or pressing Enter
+- If the user has already skipped a question, do NOT ask the same question again. Move to the next missing item.
 
+QUESTION EXAMPLES:
+- CRITICAL: "Thanks! Could you describe what's wrong with your AC?"
+- HIGH: "Great! What type of property is this? (apartment, house, commercial building, etc.)"
+- MEDIUM: "Perfect! When would you prefer to have the service? (e.g., tomorrow morning, this weekend, etc.)"
+- LOW: "Do you know what brand your AC unit is? (e.g., Carrier, Trane, Lennox, etc.) If you're not sure, just say 'skip'."
 
-CONVERSATION STRATEGIES:
+COMPLETION:
+The booking is complete when all CRITICAL and HIGH information and at least some MEDIUM information is collected, and the optional questions were answered or skipped. Then set "is_complete" to true and "next_question" to null.
 
-**Strategy A: Initial Greeting & First Critical Question**
-- Use when: Very little information has been provided (just starting)
-- Ask for: service_type OR problem_summary (pick one)
-- Example: "Hello! I'm your HVAC booking assistant. What type of service do you need today?"
+The user message contains the ANALYSIS of the current booking state (the information collected so far and what is still missing), your LAST QUESTION and the user's LATEST ANSWER. Decide "is_complete" and "next_question" from the collected information together with the latest answer.
 
-**Strategy B: Continue Critical Information Collection**
-- Use when: Some CRITICAL information is available but more is needed
-- Ask for: The next missing CRITICAL item (one at a time)
-- Example: "Thanks! Could you describe what's wrong with your AC?"
+Return ONLY a valid JSON object with the keys "booking" (new or corrected values of service_type, equipment_brand, problem_summary, severity, property_type, address, city, province, postal_code, preferred_timeslots, access_notes, contact_name, contact_phone, contact_email, constraints, confidence; null or [] when not given in the latest answer), "is_complete" (true or false) and "next_question" (the text of the single next question, or null when the booking is complete)."""
 
-**Strategy C: Move to HIGH Priority Information**
-- Use when: All CRITICAL information is complete, but HIGH priority is missing
-- Ask for: The next missing HIGH priority item (one at a time)
-- Example: "Great! What type of property is this? (apartment, house, commercial building, etc.)"
+# Dynamic part of the request. It is sent as the user message after the
+# static system prompt, so the system prompt stays byte-identical across
+# turns. At roughly 850 tokens that prefix is below OpenAI's 1024-token
+# prompt caching minimum, so these requests are not served from the prompt
+# cache; incremental extraction keeps every request this small instead of
+# growing a cacheable transcript.
+_EXTRACT_AND_ASK_CONTEXT_TEMPLATE: Final[str] = """ANALYSIS:
+- Current extracted information: {current_booking_info}
+- Missing critical information: {missing_critical_info}
+- Missing optional information: {missing_optional_info}
 
-**Strategy D: Move to MEDIUM Priority Information**
-- Use when: All CRITICAL and HIGH information is complete, but MEDIUM priority is missing
-- Ask for: The next missing MEDIUM priority item (one at a time)
-- Example: "Perfect! When would you prefer to have the service? (e.g., tomorrow morning, this weekend, etc.)"
+LAST QUESTION: {last_question}
+LATEST ANSWER: {latest_answer}
+"""
 
-**Strategy E: Move to LOW Priority Information**
-- Use when: All CRITICAL, HIGH, and MEDIUM information is complete, but LOW priority is missing
-- Ask for: The next missing LOW priority item (one at a time, mention it's optional)
-- Example: "Do you know what brand your AC unit is? (e.g., Carrier, Trane, Lennox, etc.) If you're not sure, just say 'skip'."
-- IMPORTANT: If the user has already skipped a question, do NOT ask the same question again. Move to the next missing LOW priority item.
+_OPENING_QUESTION: Final[str] = (
+    "Hello! I'm your HVAC booking assistant. What type of service do you need today?"
+)
 
-**Strategy F: Completion & Confirmation**
-- Use when: All required information (CRITICAL + HIGH + at least some MEDIUM) is complete
-- Approach: Summarize and confirm before finalizing.
 
-ANALYSIS:
-- Current extracted information: {current_booking_info}
-- Missing critical information: {missing_critical_info}
-- Conversation stage: {conversation_stage}
-
-Return a JSON object with this structure:
-{
-  "recommended_strategy": "A|B|C|D|E|F",
-  "next_questions_priority": ["The single next question to ask"],
-  "conversation_starter": "The actual text to start or continue the conversation (ask for ONE thing only)",
-  "expected_next_responses": ["What type of response we expect from the user"]
+# Questions for optional fields, asked without an LLM call after the user
+# skips one once the required information is complete
+_OPTIONAL_FIELD_QUESTIONS: Final[Dict[str, str]] = {
+    "preferred_timeslots": "When would you prefer to have the service? (e.g., tomorrow morning, this weekend, etc.)",
+    "severity": "How urgent is this? (critical, high, medium or low)",
+    "equipment_brand": "Do you know what brand your equipment is? (e.g., Carrier, Trane, Lennox, etc.) If you're not sure, just say 'skip'.",
+    "access_notes": "Are there any special access instructions for the technician, like a gate code or parking? If not, just say 'skip'.",
+    "constraints": "Do you have any other special requirements for the visit? If not, just say 'skip'.",
 }
-"""
 
 
-def get_extraction_prompt() -> str:
-    """Get prompt for extracting information from user input"""
-    return """You are a professional HVAC booking agent. Extract booking information from the user's request and return a structured JSON response.
+def get_extract_and_ask_prompt() -> str:
+    """Get prompt for extracting information and choosing the next question"""
+    return _EXTRACT_AND_ASK_PROMPT
 
-**CRITICAL: Be proactive in identifying what information is STILL MISSING after extraction.**
 
-Extract the following information from the user's input:
-- Service type (ac_repair, furnace_maintenance, installation, cleaning, ventilation_maintenance, other)
-- Problem summary
-- Contact information (name, phone, email)
-- Severity level (critical, high, medium, low)
-- Property type (apartment, detached_house, townhouse, commercial, other)
-- Address details (address, city, province, postal_code)
-- Preferred time slots
-- Access notes and constraints [OPTIONAL]
-- Equipment brand if mentioned [OPTIONAL]
-- Confidence score (0.0-1.0)
+def _to_json(value: Any) -> str:
+    """Encode a value as compact JSON text with sorted keys"""
+    return jsonutil.dumps(value, sort_keys=True).decode("utf-8")
+
+
+def get_extract_and_ask_context(
+    current_booking_info: Any,
+    missing_critical_info: List[str],
+    missing_optional_info: List[str],
+    last_question: str,
+    latest_answer: str,
+) -> str:
+    """Get the dynamic user message that follows the extract-and-ask prompt"""
+    # Compact JSON with sorted keys: one C-level encode per value instead of
+    # Python repr(), and the same state always yields the same bytes, so
+    # response cache keys stay stable
+    return _EXTRACT_AND_ASK_CONTEXT_TEMPLATE.format(
+        current_booking_info=_to_json(current_booking_info),
+        missing_critical_info=_to_json(missing_critical_info),
+        missing_optional_info=_to_json(missing_optional_info),
+        last_question=last_question,
+        latest_answer=latest_answer,
+    )
+
+
+def get_opening_question() -> str:
+    """Get the first question, asked before any information is known"""
+    return _OPENING_QUESTION
+
 
-Return ONLY a valid JSON object with this structure:
-{
-  "summary": "Brief summary of the conversation",
-  "booking": {
-    "service_type": "ac_repair",
-    "equipment_brand": null,
-    "problem_summary": "Brief description of the problem",
-    "severity": "medium",
-    "property_type": "apartment",
-    "address": "123 Main St",
-    "city": "Toronto",
-    "province": "ON",
-    "postal_code": null,
-    "preferred_timeslots": ["Tomorrow morning"],
-    "access_notes": null,
-    "contact_name": null,
-    "contact_phone": null,
-    "contact_email": null,
-    "constraints": [],
-    "confidence": 0.85
-  },
-  "missing_high_priority": ["contact_phone", "full_address"],  # Critical: Be proactive in identifying what information is STILL MISSING after extraction.
-  "suggested_next_questions": [
-    "To schedule the service, I'll need your contact phone number",
-    "Could you provide your complete address for our technician?"
-  ]
-}"""
+def get_optional_field_question(field: str) -> str:
+    """Get the question asking for an optional booking field"""
+    return _OPTIONAL_FIELD_QUESTIONS[field]
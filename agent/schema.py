@@ -12,26 +12,26 @@ Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
 """
 
 from pydantic import BaseModel, Field, ValidationError, field_validator
-from typing import List, Optional, Literal
+from typing import Any, Dict, Final, List, Optional, Literal, Type
 
 Severity = Literal["critical", "high", "medium", "low"]
+ServiceType = Literal[
+    "ac_repair",
+    "furnace_maintenance",
+    "installation",
+    "cleaning",
+    "ventilation_maintenance",
+    "other",
+]
+PropertyType = Literal["apartment", "detached_house", "townhouse", "commercial", "other"]
 
 
 class BookingIntent(BaseModel):
-    service_type: Literal[
-        "ac_repair",
-        "furnace_maintenance",
-        "installation",
-        "cleaning",
-        "ventilation_maintenance",
-        "other",
-    ]
+    service_type: ServiceType
     equipment_brand: Optional[str] = None
     problem_summary: Optional[str] = None
     severity: Optional[Severity] = None
-    property_type: Optional[
-        Literal["apartment", "detached_house", "townhouse", "commercial", "other"]
-    ] = None
+    property_type: Optional[PropertyType] = None
     address: Optional[str] = None
     city: Optional[str] = None
     province: Optional[str] = None
@@ -44,7 +44,86 @@ class BookingIntent(BaseModel):
     constraints: List[str] = Field(default_factory=list)
     confidence: float = 0.0
 
+    @field_validator(
+        "equipment_brand",
+        "problem_summary",
+        "address",
+        "city",
+        "province",
+        "postal_code",
+        "access_notes",
+        "contact_name",
+        "contact_phone",
+        "contact_email",
+        mode="before",
+    )
+    @classmethod
+    def blank_to_none(cls, value):
+        """Treat blank strings from the LLM as missing information"""
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+
+class BookingDraft(BookingIntent):
+    """Booking information collected mid-conversation, before the service is known"""
+
+    service_type: Optional[ServiceType] = None
+
 
 class AgentOutput(BaseModel):
     summary: str
     booking: BookingIntent
+
+
+class TurnResponse(BaseModel):
+    """Response to the extract-and-ask prompt"""
+
+    booking: BookingDraft = Field(default_factory=BookingDraft)
+    is_complete: bool = False
+    next_question: Optional[str] = None
+
+
+def _make_strict(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite a JSON Schema node in place for OpenAI strict mode"""
+    # Every field is always sent in strict mode, so defaults are meaningless
+    schema.pop("default", None)
+
+    properties = schema.get("properties")
+    if properties is not None:
+        schema["required"] = list(properties)
+        schema["additionalProperties"] = False
+        for subschema in properties.values():
+            _make_strict(subschema)
+
+    if isinstance(schema.get("items"), dict):
+        _make_strict(schema["items"])
+    for key in ("anyOf", "allOf", "oneOf"):
+        for subschema in schema.get(key, []):
+            _make_strict(subschema)
+    for subschema in schema.get("$defs", {}).values():
+        _make_strict(subschema)
+
+    return schema
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build the JSON Schema of a model for OpenAI strict structured outputs
+
+    Strict mode requires every object to list all of its properties as
+    required and to forbid additional properties; optional fields stay
+    nullable.
+
+    Args:
+        model: Pydantic model class
+
+    Returns:
+        JSON Schema dict
+    """
+    return _make_strict(model.model_json_schema())
+
+
+# Generated once at import time
+AGENT_OUTPUT_SCHEMA: Final[Dict[str, Any]] = strict_json_schema(AgentOutput)
+TURN_RESPONSE_SCHEMA: Final[Dict[str, Any]] = strict_json_schema(TurnResponse)
@@ -0,0 +1,100 @@
+"""
+HVAC Booking Agent - Semantic Cache
+
+In-process semantic response cache for HVAC booking conversations.
+
+Customers describe the same problem in near-identical ways ("AC not
+cooling", "AC won't cool down"). The cache stores the embedding of each
+conversation next to the raw LLM response and returns that response when a
+new conversation is similar enough.
+
+Author: Qian Sun
+Date: 2026-10-15
+Version: 1.0.0
+License: MIT License
+
+Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Minimum cosine similarity for a cache hit
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so cosine similarity is a dot product"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0.0:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+class SemanticCache:
+    """Semantic cache of LLM responses keyed by conversation embedding"""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: minimum cosine similarity for a cache hit
+            max_entries: maximum number of entries per namespace, the oldest
+                entries are evicted first
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: Dict[str, "OrderedDict[int, Tuple[List[float], str]]"] = {}
+        self._next_id = 0
+
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[str]:
+        """
+        Find the cached response most similar to an embedding
+
+        Args:
+            namespace: cache namespace, e.g. a hash of the system prompt
+            embedding: embedding of the conversation
+
+        Returns:
+            cached response content, or None if nothing is similar enough
+        """
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+
+        query = _normalize(embedding)
+        best_score = self.threshold
+        best_content = None
+        for cached_embedding, content in entries.values():
+            score = sum(a * b for a, b in zip(query, cached_embedding))
+            if score >= best_score:
+                best_score = score
+                best_content = content
+
+        return best_content
+
+    def store(self, namespace: str, embedding: List[float], content: str) -> None:
+        """
+        Store a response in the cache
+
+        Args:
+            namespace: cache namespace, e.g. a hash of the system prompt
+            embedding: embedding of the conversation
+            content: raw response content
+        """
+        entries = self._entries.setdefault(namespace, OrderedDict())
+        entries[self._next_id] = (_normalize(embedding), content)
+        self._next_id += 1
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        self._entries.clear()
@@ -0,0 +1,77 @@
+"""
+HVAC Booking Agent - Booking Validator
+
+Deterministic completeness check of booking data.
+
+Missing information is computed locally from the priority ladder used by
+the guidance prompt, so no LLM round-trip is needed to decide what to ask
+for next.
+
+Author: Qian Sun
+Date: 2026-10-15
+Version: 1.0.0
+License: MIT License
+
+Copyright (c) 2025 Qian Sun. Licensed under the MIT License.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+# Information collection priority, in the order fields are asked for
+CRITICAL = ("service_type", "problem_summary", "contact_name", "contact_phone")
+HIGH = ("property_type", "address", "city", "province")
+MEDIUM = ("preferred_timeslots", "severity")
+LOW = ("equipment_brand", "access_notes", "constraints")
+
+PRIORITY_TIERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("CRITICAL", CRITICAL),
+    ("HIGH", HIGH),
+    ("MEDIUM", MEDIUM),
+    ("LOW", LOW),
+)
+
+# Tiers that must be complete before a booking can be made
+REQUIRED_TIERS = ("CRITICAL", "HIGH")
+
+
+def missing_fields(booking_data: Dict[str, Any], fields: Tuple[str, ...]) -> List[str]:
+    """
+    Get the fields that are neither filled in nor skipped by the user
+
+    Args:
+        booking_data: booking data collected so far
+        fields: fields to check
+
+    Returns:
+        missing fields, in priority order
+    """
+    return [
+        field
+        for field in fields
+        if not booking_data.get(field) and not booking_data.get(f"{field}_skipped")
+    ]
+
+
+def check(booking_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check booking data against the priority ladder
+
+    Args:
+        booking_data: booking data collected so far
+
+    Returns:
+        dictionary with `is_complete` (no required field is missing),
+        `missing_fields` (missing fields of the first incomplete tier) and
+        `next_priority` (name of that tier, or None when nothing is missing)
+    """
+    for tier, fields in PRIORITY_TIERS:
+        missing = missing_fields(booking_data, fields)
+        if missing:
+            # Tiers are checked in order, so every earlier tier is complete
+            return {
+                "is_complete": tier not in REQUIRED_TIERS,
+                "missing_fields": missing,
+                "next_priority": tier,
+            }
+
+    return {"is_complete": True, "missing_fields": [], "next_priority": None}
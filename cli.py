@@ -14,44 +14,104 @@ Usage:
 
 Options:
     --api-key TEXT     OpenAI API key
-    --model TEXT       OpenAI model to use (default: gpt-4)
+    --model TEXT       OpenAI model to use (default: gpt-4o-mini)
     --verbose          Enable verbose output
+    --no-cache         Do not use the on-disk LLM response cache
+    --no-local-classify
+                       Leave service type detection to the LLM
 
 Examples:
     python cli.py
-    python cli.py --model gpt-4-turbo
+    python cli.py --model gpt-4o
     python cli.py --api-key sk-xxx --verbose
-    python cli.py --api-key sxxxxx --model gpt-4-turbo --verbose
+    python cli.py --api-key sxxxxx --model gpt-4o --verbose
 """
 
-import json
+import asyncio
+import atexit
+import logging
+import os
+import sqlite3
 import sys
+import threading
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, Optional, Any, List
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
 
 import click
 from rich.console import Console
+from rich.live import Live
+from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 
-from agent.llm_client import create_llm_client
+# Only the lightweight agent modules are imported here; the LLM stack
+# (openai, pydantic) is imported inside the functions that use it
+from agent.classifier import classify_service_type
+from agent import jsonutil, validator
 from agent.prompt import (
-    get_guidance_prompt,
-    get_extraction_prompt,
+    get_extract_and_ask_prompt,
+    get_extract_and_ask_context,
+    get_opening_question,
+    get_optional_field_question,
 )
 
 # Initialize Rich console
 console = Console()
 
+# Re-parse the partial response JSON every N streamed chunks
+PARTIAL_PARSE_EVERY = 4
+
+# Requests per turn when the response does not match the TurnResponse schema
+MAX_RESPONSE_ATTEMPTS = 2
+
+# Answers that cancel the booking, and answers that skip an optional question
+_QUIT_WORDS: Final[FrozenSet[str]] = frozenset({"quit", "exit", "cancel"})
+_SKIP_WORDS: Final[FrozenSet[str]] = frozenset({"skip", "no", "n/a", ""})
+
+# Asked when the LLM returns no question but the booking is not complete
+FALLBACK_QUESTION = "Could you provide more information?"
+
+# Booking records file, opened once per session
+RECORDS_FILENAME = "booking_records.jsonl"
+_record_fd: Optional[int] = None
+
+# Time zone of record timestamps, bound once instead of looked up per record
+_UTC: Final = timezone.utc
+
 
 @click.command()
 @click.option("--api-key", envvar="OPENAI_API_KEY", help="OpenAI API key")
-@click.option("--model", default="gpt-4", help="OpenAI model to use")
+@click.option("--model", default="gpt-4o-mini", help="OpenAI model to use")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
-def main(api_key: str, model: str, verbose: bool):
+@click.option(
+    "--no-cache", is_flag=True, help="Do not use the on-disk LLM response cache"
+)
+@click.option(
+    "--no-local-classify",
+    is_flag=True,
+    help="Leave service type detection to the LLM",
+)
+def main(
+    api_key: str, model: str, verbose: bool, no_cache: bool, no_local_classify: bool
+):
     """HVAC Booking Agent - Structured Booking Process"""
 
+    # Library logs (API calls, token usage) are only shown in verbose mode
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING)
+
     # Check API key
     if not api_key:
         console.print("[red]Error: OpenAI API key is required[/red]")
@@ -59,10 +119,24 @@ def main(api_key: str, model: str, verbose: bool):
         sys.exit(1)
 
     # Start booking process
-    start_booking_process(api_key, model, verbose)
+    asyncio.run(
+        start_booking_process(
+            api_key,
+            model,
+            verbose,
+            use_cache=not no_cache,
+            local_classify=not no_local_classify,
+        )
+    )
 
 
-def start_booking_process(api_key: str, model: str, verbose: bool):
+async def start_booking_process(
+    api_key: str,
+    model: str,
+    verbose: bool,
+    use_cache: bool = True,
+    local_classify: bool = True,
+):
     """Start prompt chain booking process"""
 
     # Display welcome message
@@ -72,27 +146,44 @@ def start_booking_process(api_key: str, model: str, verbose: bool):
     )
     console.print(Panel.fit(welcome_message, title="Welcome"))
 
-    try:
-        # Create LLM client
-        client = create_llm_client(api_key=api_key, model=model)
-
-        # Test connection
-        with console.status("[bold green]Testing API connection..."):
-            if not client.test_connection():
-                console.print("[red]❌ API connection failed![/red]")
-                return
+    # The LLM stack takes most of the startup time; importing it here lets
+    # `--help` or a missing API key return without loading it
+    from agent.llm_cache import LLMCache
+    from agent.llm_client import aclose_default_client, get_default_client
 
-        console.print("[green]✅ Connected to OpenAI API[/green]")
+    connection_check = None
+    try:
+        # Create LLM client. The response cache is only an optimization, so
+        # run without it if its database cannot be opened.
+        cache = None
+        if use_cache:
+            try:
+                cache = LLMCache()
+            except (OSError, sqlite3.Error) as e:
+                console.print(
+                    f"[yellow]Response cache unavailable, continuing without it: {e}[/yellow]"
+                )
+        client = get_default_client(api_key=api_key, model=model, cache=cache)
+
+        # Test connection while the user answers the opening question, which
+        # needs no LLM call; skipped if a recent run already succeeded. Its
+        # failures are logged quietly so they do not interrupt the prompt;
+        # the result is reported when the test is awaited.
+        connection_check = asyncio.create_task(
+            client.check_connection(quiet=True)
+        )
 
         # Start prompt chain process
-        booking_data = run_prompt_chain(client)
+        booking_data = await run_prompt_chain(
+            client, connection_check, local_classify=local_classify
+        )
 
         if not booking_data:
             console.print("[yellow]Booking cancelled[/yellow]")
             return
 
         # Confirm information
-        if confirm_booking_information(booking_data):
+        if confirm_booking_information(booking_data, verbose):
             # Save booking record directly
             save_booking_record_simple(booking_data)
         else:
@@ -101,57 +192,71 @@ def start_booking_process(api_key: str, model: str, verbose: bool):
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
 
+    finally:
+        if connection_check is not None and not connection_check.done():
+            connection_check.cancel()
+        await aclose_default_client()
 
-def run_prompt_chain(client) -> Optional[Dict[str, Any]]:
-    """Run the prompt chain process to collect booking information"""
+
+async def run_prompt_chain(
+    client,
+    connection_check: Optional[Awaitable[bool]] = None,
+    local_classify: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the prompt chain process to collect booking information
+
+    Args:
+        client: LLM client
+        connection_check: pending connection test, awaited before the first
+            LLM call
+        local_classify: whether to detect the service type with the local
+            keyword classifier before asking the LLM
+    """
 
     console.print("\n[bold cyan]Let's start with your HVAC service request[/bold cyan]")
     console.print("=" * 50)
 
-    # Initialize conversation state
-    conversation_history = []
+    # Initialize conversation state. Extraction is incremental: each request
+    # carries the merged booking data, the last question and the newest
+    # answer only, so its size does not grow with the conversation. The last
+    # few answers are kept for the skip check.
+    recent_turns: Deque[str] = deque(maxlen=3)
     current_booking_data = {}
     max_iterations = 10  # Prevent infinite loops
     iteration = 0
 
+    # The opening question does not depend on any answer, so it needs no LLM call
+    last_question = get_opening_question()
+    display_question(last_question, 1)
+
     while iteration < max_iterations:
         iteration += 1
 
-        console.print(f"\n[dim]Processing your request... (Step {iteration})[/dim]")
-
         try:
-            # Step 1: Get conversation guidance strategy
-            guidance_result = get_conversation_guidance(
-                client, current_booking_data, conversation_history
-            )
-
-            if not guidance_result:
-                console.print("[red]Failed to get conversation guidance[/red]")
-                return None
-
-            # Step 2: Use guidance to interact with user
-            if guidance_result.get("recommended_strategy") == "A" and iteration == 1:
-                # Initial greeting and first question
-                console.print(
-                    f"\n[bold green]{guidance_result.get('conversation_starter', 'Hi! How can I help you with HVAC services?')}[/bold green]"
-                )
-            else:
-                # Follow-up questions
-                console.print(
-                    f"\n[bold blue]{guidance_result.get('conversation_starter', 'Could you provide more information?')}[/bold blue]"
-                )
-
-            # Get user response
-            user_response = Prompt.ask("Your answer")
+            # Step 1: Get user response without blocking the event loop
+            user_response = await read_answer("Your answer")
+            # Trimmed once, so the history and the request (and with it the
+            # cache key) do not depend on stray whitespace
+            user_response = user_response.strip()
+
+            if not user_response and not is_booking_complete(current_booking_data):
+                # An accidental Enter on a required question carries nothing
+                # to extract; ask again without an LLM call. Only optional
+                # questions can be skipped by pressing Enter.
+                console.print("[dim](empty input ignored)[/dim]")
+                iteration -= 1  # not a turn
+                continue
 
-            if user_response.lower() in ["quit", "exit", "cancel"]:
+            answer = user_response.lower()
+            if answer in _QUIT_WORDS:
                 console.print("[yellow]Booking cancelled by user[/yellow]")
                 return None
-            elif user_response.lower() in ["skip", "no", "n/a", ""]:
+            elif answer in _SKIP_WORDS:
                 # User wants to skip optional questions
                 console.print("[dim]Skipping optional information...[/dim]")
-                # Add skip response to conversation history so LLM knows user skipped
-                conversation_history.append(f"User skipped: {user_response}")
+                # Record the skip so the LLM knows the user skipped
+                recent_turns.append(f"User skipped: {user_response}")
                 
                 # Mark the current missing optional field as skipped
                 optional_missing = get_missing_optional_info(current_booking_data)
@@ -159,32 +264,113 @@ def run_prompt_chain(client) -> Optional[Dict[str, Any]]:
                     # Mark the first missing optional field as skipped
                     skipped_field = optional_missing[0]
                     current_booking_data[f"{skipped_field}_skipped"] = True
-                
-                # Continue to next iteration
-                continue
 
-            # Add to conversation history
-            conversation_history.append(user_response)
-
-            # Step 3: Extract information from current conversation
-            extracted_data = extract_booking_information(client, conversation_history)
+                # A skip carries nothing to extract, so once the required
+                # information is in, the next step is decided without the LLM
+                if is_booking_complete(current_booking_data):
+                    if not should_ask_optional_info(
+                        current_booking_data, iteration, list(recent_turns)
+                    ):
+                        console.print(
+                            "[green]✅ All required information collected![/green]"
+                        )
+                        break
+
+                    optional_missing = get_missing_optional_info(current_booking_data)
+                    if optional_missing:
+                        last_question = get_optional_field_question(
+                            optional_missing[0]
+                        )
+                        display_question(last_question, iteration + 1)
+                        continue
+            else:
+                # Add to conversation history
+                recent_turns.append(user_response)
+
+                # The service type is usually obvious from the answer; fill it
+                # in locally so the LLM sees it as already known. The LLM can
+                # still correct it.
+                if local_classify and not current_booking_data.get("service_type"):
+                    service_type = classify_service_type(user_response)
+                    if service_type is not None:
+                        current_booking_data["service_type"] = service_type
+
+            # The connection test ran while the user was typing
+            if connection_check is not None:
+                connected = await connection_check
+                connection_check = None
+                if not connected:
+                    console.print("[red]❌ API connection failed![/red]")
+                    return None
+
+            console.print(f"\n[dim]Processing your request... (Step {iteration})[/dim]")
+
+            # Step 2: Extract information and get the next question in one
+            # call, rendering the question live while it streams in. If our
+            # own check may end the chain this turn, wait for the full answer
+            # instead of showing a question that would never be asked.
+            live: Optional[Live] = None
+
+            def show_question(question: str) -> None:
+                nonlocal live
+                if live is None:
+                    console.print()
+                    live = Live(console=console, auto_refresh=False)
+                    live.start()
+                live.update(Text(question, style="bold blue"), refresh=True)
+
+            may_finish = is_booking_complete(
+                current_booking_data
+            ) and not should_ask_optional_info(
+                current_booking_data, iteration, list(recent_turns)
+            )
 
-            if not extracted_data:
-                console.print("[red]Failed to extract booking information[/red]")
+            turn = None
+            try:
+                turn = await extract_and_ask(
+                    client,
+                    last_question,
+                    recent_turns[-1],
+                    current_booking_data,
+                    on_question=None if may_finish else show_question,
+                )
+            finally:
+                # Also on Ctrl-C or cancellation mid-stream, so the cursor and
+                # stdout are handed back to the terminal
+                if live is not None:
+                    # Render the complete question and leave it on screen
+                    if turn is not None and turn[1]:
+                        show_question(turn[1])
+                    live.stop()
+                    if not console.is_terminal:
+                        # Live only ends its line itself on a terminal
+                        console.line()
+
+            if turn is None:
+                console.print("[red]Failed to process your answer[/red]")
                 return None
 
-            # Update current booking data with extracted information
+            extracted_data, next_question, llm_complete = turn
+
+            # Merge the new and corrected fields into the booking data
             current_booking_data.update(extracted_data)
 
-            # Step 4: Check if we have enough information
-            # Use both LLM strategy and our own completion check
-            if guidance_result.get("recommended_strategy") == "F":
-                console.print("[green]✅ All required information collected![/green]")
-                break
-            elif is_booking_complete(current_booking_data) and not should_ask_optional_info(current_booking_data, iteration, conversation_history):
+            # Step 3: Check if we have enough information
+            # Cross-check the LLM's verdict with our own completion check
+            if is_booking_complete(current_booking_data) and (
+                llm_complete
+                or not should_ask_optional_info(
+                    current_booking_data, iteration, list(recent_turns)
+                )
+            ):
                 console.print("[green]✅ All required information collected![/green]")
                 break
 
+            # Step 4: Ask the next question
+            last_question = next_question or FALLBACK_QUESTION
+            if live is None:
+                display_question(last_question, iteration + 1)
+
         except Exception as e:
             console.print(f"[red]Error in prompt chain: {str(e)}[/red]")
             return None
@@ -197,92 +383,177 @@ def run_prompt_chain(client) -> Optional[Dict[str, Any]]:
     return current_booking_data
 
 
-def get_conversation_guidance(
-    client, current_booking_data: Dict[str, Any], conversation_history: List[str]
-) -> Optional[Dict[str, Any]]:
-    """Get conversation guidance strategy using the new guidance prompt"""
+async def read_answer(prompt: str) -> str:
+    """
+    Ask for an answer without blocking the event loop
+
+    The prompt runs in a daemon thread rather than the default executor:
+    on Ctrl-C, asyncio.run waits for executor threads to finish, and a
+    thread blocked in input() would keep the process alive.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+
+    def resolve(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return  # cancelled, e.g. by Ctrl-C
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def ask() -> None:
+        result, error = None, None
+        try:
+            result = Prompt.ask(prompt)
+        except BaseException as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            pass  # the event loop has already been closed
+
+    threading.Thread(target=ask, daemon=True).start()
+    return await future
+
+
+def display_question(question: Optional[str], iteration: int) -> None:
+    """Display the next question to ask the user"""
+    if iteration == 1:
+        # Initial greeting and first question
+        console.print(
+            f"\n[bold green]{question or 'Hi! How can I help you with HVAC services?'}[/bold green]"
+        )
+    else:
+        # Follow-up questions
+        console.print(
+            f"\n[bold blue]{question or FALLBACK_QUESTION}[/bold blue]"
+        )
+
+
+def parse_partial_json(buffer: bytearray) -> Optional[Dict[str, Any]]:
+    """Parse an incomplete JSON object, keeping a trailing unfinished string"""
+    from pydantic_core import from_json
 
     try:
-        # Build context for guidance analysis
-        context = f"""
-Current extracted information: {current_booking_data}
-Missing critical information: {get_missing_critical_info(current_booking_data)}
-Missing optional information: {get_missing_optional_info(current_booking_data)}
-Conversation stage: {len(conversation_history)} turns
-"""
+        partial = from_json(buffer, allow_partial="trailing-strings")
+    except ValueError:
+        return None
+    return partial if isinstance(partial, dict) else None
+
+
+async def extract_and_ask(
+    client,
+    last_question: str,
+    latest_answer: str,
+    current_booking_data: Dict[str, Any],
+    on_question: Optional[Callable[[str], None]] = None,
+) -> Optional[Tuple[Dict[str, Any], Optional[str], bool]]:
+    """
+    Extract booking information and choose the next question in one LLM call
+
+    Extraction is incremental: the LLM sees the booking data collected so far
+    and only the newest question and answer, and returns the fields that the
+    answer adds or corrects.
+
+    The response is streamed. When `on_question` is given, it is called with
+    the partial next question each time more of it has streamed in, so the
+    user can start reading before the response is complete.
+
+    Returns:
+        tuple of the new or corrected booking fields, the next question (None when
+        the LLM considers the booking complete) and the LLM's completion
+        verdict, or None on error
+    """
+
+    from pydantic import ValidationError
+
+    from agent.llm_client import TURN_RESPONSE_FORMAT
+    from agent.schema import TurnResponse
+
+    try:
+        # Static prompt first, dynamic state last (see prompt.py on caching)
+        context = get_extract_and_ask_context(
+            current_booking_data,
+            get_missing_critical_info(current_booking_data),
+            get_missing_optional_info(current_booking_data),
+            last_question,
+            latest_answer,
+        )
 
         messages = [
-            {"role": "system", "content": get_guidance_prompt()},
+            {"role": "system", "content": get_extract_and_ask_prompt()},
             {"role": "user", "content": context},
         ]
 
-        response_content = client._chat_completion(messages, temperature=1)
+        # UTF-8 bytes of the response so far, only parsed to show the partial
+        # question; the complete response is validated by the client
+        buffer = bytearray()
+        chunk_count = 0
+        streamed_question = None
+
+        def on_token(delta: str) -> None:
+            nonlocal chunk_count, streamed_question
+            if on_question is None:
+                return
+            buffer.extend(delta.encode("utf-8"))
+            chunk_count += 1
+            if chunk_count % PARTIAL_PARSE_EVERY:
+                return
 
-        # Parse JSON response
-        guidance_result = json.loads(response_content)
+            partial = parse_partial_json(buffer)
+            question = partial.get("next_question") if partial else None
+            if question and question != streamed_question:
+                streamed_question = question
+                on_question(question)
+
+        for attempt in range(MAX_RESPONSE_ATTEMPTS):
+            buffer.clear()
+            chunk_count = 0
+
+            # Structured outputs constrain the response to the TurnResponse
+            # schema. The client parses and validates the full response in
+            # one pass before caching it, so a malformed one (e.g. cut off at
+            # the token limit) is never cached; it is requested again right
+            # away instead of ending the chain, and the valid retry is cached.
+            try:
+                turn = await client._chat_completion_stream(
+                    messages,
+                    on_token,
+                    temperature=0.1,
+                    response_format=TURN_RESPONSE_FORMAT,
+                    validate=TurnResponse.model_validate_json,
+                )
+                break
+            except ValidationError:
+                if attempt + 1 == MAX_RESPONSE_ATTEMPTS:
+                    raise
+                console.print("[dim]Incomplete response, retrying...[/dim]")
 
-        return guidance_result
+        # Keep only the fields that were found
+        booking = turn.booking.model_dump(exclude_none=True, exclude_defaults=True)
+        return booking, turn.next_question, turn.is_complete
 
     except Exception as e:
-        console.print(f"[red]Error getting conversation guidance: {str(e)}[/red]")
+        console.print(f"[red]Error processing your answer: {str(e)}[/red]")
         return None
 
 
 def get_missing_critical_info(booking_data: Dict[str, Any]) -> List[str]:
     """Determine what critical information is missing"""
-    missing = []
-
-    # CRITICAL priority information (required for booking)
-    if not booking_data.get("service_type"):
-        missing.append("service_type")
-    if not booking_data.get("problem_summary"):
-        missing.append("problem_summary")
-    if not booking_data.get("contact_name"):
-        missing.append("contact_name")
-    if not booking_data.get("contact_phone"):
-        missing.append("contact_phone")
-    
-    # HIGH priority information (required for scheduling)
-    if not booking_data.get("property_type"):
-        missing.append("property_type")
-    if not booking_data.get("address"):
-        missing.append("address")
-    if not booking_data.get("city"):
-        missing.append("city")
-    if not booking_data.get("province"):
-        missing.append("province")
-
-    return missing
+    # CRITICAL (required for booking) and HIGH (required for scheduling)
+    return validator.missing_fields(booking_data, validator.CRITICAL + validator.HIGH)
 
 
 def get_missing_optional_info(booking_data: Dict[str, Any]) -> List[str]:
     """Determine what optional information is missing"""
-    missing = []
-    
-    # MEDIUM priority information (preferred but not strictly required)
-    if not booking_data.get("preferred_timeslots") and not booking_data.get("preferred_timeslots_skipped"):
-        missing.append("preferred_timeslots")
-    if not booking_data.get("severity") and not booking_data.get("severity_skipped"):
-        missing.append("severity")
-    
-    # LOW priority information (optional)
-    if not booking_data.get("equipment_brand") and not booking_data.get("equipment_brand_skipped"):
-        missing.append("equipment_brand")
-    if not booking_data.get("access_notes") and not booking_data.get("access_notes_skipped"):
-        missing.append("access_notes")
-    if not booking_data.get("constraints") and not booking_data.get("constraints_skipped"):
-        missing.append("constraints")
-    
-    return missing
+    # MEDIUM (preferred but not strictly required) and LOW (optional)
+    return validator.missing_fields(booking_data, validator.MEDIUM + validator.LOW)
 
 
 def is_booking_complete(booking_data: Dict[str, Any]) -> bool:
     """Check if we have all required information for booking"""
-    critical_missing = get_missing_critical_info(booking_data)
-    
-    # If no critical info is missing, consider booking complete
-    # Optional fields (equipment_brand, access_notes, constraints) are not required
-    return len(critical_missing) == 0
+    return validator.check(booking_data)["is_complete"]
 
 
 def should_ask_optional_info(booking_data: Dict[str, Any], iteration: int, conversation_history: List[str] = None) -> bool:
@@ -291,8 +562,18 @@ def should_ask_optional_info(booking_data: Dict[str, Any], iteration: int, conve
     if not is_booking_complete(booking_data):
         return False
     
-    # Check if we have MEDIUM priority info (preferred_timeslots or severity)
-    has_medium_info = booking_data.get("preferred_timeslots") or booking_data.get("severity")
+    # Check if user has already skipped these questions
+    if conversation_history:
+        recent_skips = [turn for turn in conversation_history[-3:] if "User skipped" in turn]
+        # If user has skipped multiple times recently, don't keep asking
+        if len(recent_skips) >= 2:
+            return False
+
+    # Check if we have MEDIUM priority info (preferred_timeslots or severity);
+    # a skipped MEDIUM question counts as answered
+    has_medium_info = len(validator.missing_fields(booking_data, validator.MEDIUM)) < len(
+        validator.MEDIUM
+    )
     
     # If we don't have MEDIUM info yet, continue asking
     if not has_medium_info:
@@ -300,183 +581,147 @@ def should_ask_optional_info(booking_data: Dict[str, Any], iteration: int, conve
     
     # If we have MEDIUM info, check if we should ask for LOW priority info
     optional_missing = get_missing_optional_info(booking_data)
-    low_priority_missing = [item for item in optional_missing if item in ["equipment_brand", "access_notes", "constraints"]]
-    
-    # Check if user has already skipped these questions
-    if conversation_history:
-        recent_skips = [turn for turn in conversation_history[-3:] if "User skipped" in turn]
-        # If user has skipped multiple times recently, don't keep asking
-        if len(recent_skips) >= 2:
-            return False
+    low_priority_missing = [item for item in optional_missing if item in validator.LOW]
     
     # Give 2-3 chances for LOW priority info after MEDIUM is complete
     return len(low_priority_missing) > 0 and iteration <= 8
 
 
-def extract_booking_information(
-    client, conversation_history: List[str]
-) -> Optional[Dict[str, Any]]:
-    """Extract booking information from conversation using LLM"""
-
-    try:
-        # Build conversation content
-        conversation_content = "\n".join(
-            [f"Turn {i + 1}: {turn}" for i, turn in enumerate(conversation_history)]
-        )
-
-        # Process with LLM
-        messages = [
-            {"role": "system", "content": get_extraction_prompt()},
-            {"role": "user", "content": conversation_content},
-        ]
-
-        response_content = client._chat_completion(messages, temperature=0.1)
-
-        response_data = json.loads(response_content)
-
-        # Extract booking data from response
-        booking_data = response_data.get("booking", {})
-
-        # Convert to simple dict format for easier processing
-        result = {}
-        for key, value in booking_data.items():
-            if value is not None and value != "" and value != []:
-                result[key] = value
+def _truncate(text: str, n: int = 50) -> str:
+    """Shorten long free text to `n` characters for table display"""
+    return text if len(text) <= n else text[:n] + "..."
+
+
+def _join(value: Any) -> str:
+    """Display a list field as comma-separated text"""
+    return ", ".join(value) if isinstance(value, list) else str(value)
+
+
+SERVICE_TYPE_MAP: Final[Dict[str, str]] = {
+    "ac_repair": "AC Repair",
+    "furnace_maintenance": "Furnace Maintenance",
+    "installation": "Equipment Installation",
+    "cleaning": "Cleaning Service",
+    "ventilation_maintenance": "Ventilation System Maintenance",
+    "other": "Other Service",
+}
+
+SEVERITY_MAP: Final[Dict[str, str]] = {
+    "critical": "Critical",
+    "high": "High",
+    "medium": "Medium",
+    "low": "Low",
+}
+
+PROPERTY_TYPE_MAP: Final[Dict[str, str]] = {
+    "apartment": "Apartment",
+    "detached_house": "Detached House",
+    "townhouse": "Townhouse",
+    "commercial": "Commercial Building",
+    "other": "Other",
+}
+
+# Parts of the "Address" row, in display order
+ADDRESS_FIELDS = ("address", "city", "province", "postal_code")
+
+# Rows of the confirmation table: (booking key, label, formatter)
+DISPLAY_FIELDS: Tuple[Tuple[str, str, Callable[[Any], str]], ...] = (
+    ("service_type", "Service Type", lambda v: SERVICE_TYPE_MAP.get(v, "Unknown")),
+    ("problem_summary", "Problem Description", _truncate),
+    ("severity", "Severity Level", lambda v: SEVERITY_MAP.get(v, "Unknown")),
+    ("property_type", "Property Type", lambda v: PROPERTY_TYPE_MAP.get(v, "Unknown")),
+    ("address", "Address", str),
+    ("contact_name", "Contact Name", str),
+    ("contact_phone", "Phone", str),
+    ("contact_email", "Email", str),
+    ("preferred_timeslots", "Time Preference", _join),
+    ("equipment_brand", "Equipment Brand", str),
+    ("access_notes", "Access Notes", _truncate),
+    ("constraints", "Special Requirements", lambda v: _truncate(_join(v))),
+)
 
-        return result
+# Rows shown as "Unknown" rather than omitted when the value is missing
+ALWAYS_SHOWN_FIELDS = frozenset({"service_type", "severity", "property_type"})
 
-    except Exception as e:
-        console.print(f"[red]Error extracting information: {str(e)}[/red]")
-        return None
 
+def confirm_booking_information(booking_data: Dict, verbose: bool = False) -> bool:
+    """
+    Confirm booking information
 
-def confirm_booking_information(booking_data: Dict) -> bool:
-    """Confirm booking information"""
+    Args:
+        booking_data: collected booking data
+        verbose: show the information as a table instead of plain lines
+    """
 
     console.print("\n[bold cyan]Please confirm your booking information[/bold cyan]")
     console.print("=" * 50)
 
-    # Create information table
-    table = Table(title="Booking Information Confirmation")
-    table.add_column("Item", style="cyan")
-    table.add_column("Information", style="green")
-
-    # Add service type
-    service_type_map = {
-        "ac_repair": "AC Repair",
-        "furnace_maintenance": "Furnace Maintenance",
-        "installation": "Equipment Installation",
-        "cleaning": "Cleaning Service",
-        "ventilation_maintenance": "Ventilation System Maintenance",
-        "other": "Other Service",
-    }
-    table.add_row(
-        "Service Type",
-        service_type_map.get(booking_data.get("service_type", ""), "Unknown"),
+    # Bind the lookup once; each field is read a single time
+    get_field = booking_data.get
+
+    # The address row combines all address parts
+    full_address = ", ".join(
+        part for part in map(get_field, ADDRESS_FIELDS) if part
     )
 
-    # Add problem description
-    if booking_data.get("problem_summary"):
-        table.add_row(
-            "Problem Description",
-            (
-                booking_data["problem_summary"][:50] + "..."
-                if len(booking_data["problem_summary"]) > 50
-                else booking_data["problem_summary"]
-            ),
-        )
+    rows: List[Tuple[str, str]] = []
+    for key, label, formatter in DISPLAY_FIELDS:
+        value = full_address if key == "address" else get_field(key)
+        if value or key in ALWAYS_SHOWN_FIELDS:
+            rows.append((label, formatter(value)))
+
+    if verbose:
+        table = Table(title="Booking Information Confirmation")
+        table.add_column("Item", style="cyan")
+        table.add_column("Information", style="green")
+        for label, text in rows:
+            table.add_row(label, text)
+        console.print(table)
+    else:
+        # One styled line per item skips the table layout pass
+        summary = Text()
+        for label, text in rows:
+            summary.append(f"{label}: ", style="cyan")
+            summary.append(f"{text}\n", style="green")
+        console.print(summary, end="")
 
-    # Add severity level
-    severity_map = {
-        "critical": "Critical",
-        "high": "High",
-        "medium": "Medium",
-        "low": "Low",
-    }
-    table.add_row(
-        "Severity Level", severity_map.get(booking_data.get("severity", ""), "Unknown")
-    )
+    # Confirm using interaction prompts
+    return Confirm.ask("\nPlease confirm if the above information is correct?")
 
-    # Add property type
-    property_type_map = {
-        "apartment": "Apartment",
-        "detached_house": "Detached House",
-        "townhouse": "Townhouse",
-        "commercial": "Commercial Building",
-        "other": "Other",
-    }
-    table.add_row(
-        "Property Type",
-        property_type_map.get(booking_data.get("property_type", ""), "Unknown"),
-    )
 
-    # Add address information
-    address_parts = []
-    if booking_data.get("address"):
-        address_parts.append(booking_data["address"])
-    if booking_data.get("city"):
-        address_parts.append(booking_data["city"])
-    if booking_data.get("province"):
-        address_parts.append(booking_data["province"])
-    if booking_data.get("postal_code"):
-        address_parts.append(booking_data["postal_code"])
-
-    if address_parts:
-        table.add_row("Address", ", ".join(address_parts))
-
-    # Add contact information
-    if booking_data.get("contact_name"):
-        table.add_row("Contact Name", booking_data["contact_name"])
-    if booking_data.get("contact_phone"):
-        table.add_row("Phone", booking_data["contact_phone"])
-    if booking_data.get("contact_email"):
-        table.add_row("Email", booking_data["contact_email"])
-
-    # Add time preference
-    if booking_data.get("preferred_timeslots"):
-        time_slots = booking_data["preferred_timeslots"]
-        if isinstance(time_slots, list):
-            time_display = ", ".join(time_slots)
-        else:
-            time_display = str(time_slots)
-        table.add_row("Time Preference", time_display)
-
-    # Add equipment brand
-    if booking_data.get("equipment_brand"):
-        table.add_row("Equipment Brand", booking_data["equipment_brand"])
-
-    # Add access notes
-    if booking_data.get("access_notes"):
-        table.add_row(
-            "Access Notes",
-            (
-                booking_data["access_notes"][:50] + "..."
-                if len(booking_data["access_notes"]) > 50
-                else booking_data["access_notes"]
-            ),
+def _get_record_fd() -> int:
+    """Open the booking records file on first use, keeping it open until exit"""
+    global _record_fd
+    if _record_fd is None:
+        _record_fd = os.open(
+            RECORDS_FILENAME, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
         )
+        atexit.register(_close_record_fd)
+    return _record_fd
 
-    # Add special requirements
-    if booking_data.get("constraints"):
-        constraints = booking_data["constraints"]
-        if isinstance(constraints, list):
-            constraints_display = ", ".join(constraints)
-        else:
-            constraints_display = str(constraints)
-        
-        table.add_row(
-            "Special Requirements",
-            (
-                constraints_display[:50] + "..."
-                if len(constraints_display) > 50
-                else constraints_display
-            ),
-        )
 
-    console.print(table)
+def _write_record(data: bytes) -> None:
+    """
+    Append one encoded record to the booking records file
 
-    # Confirm using interaction prompts
-    return Confirm.ask("\nPlease confirm if the above information is correct?")
+    The record is handed to the kernel in a single write(), which O_APPEND
+    places atomically at the end of the file. The loop only matters in the
+    rare case of a short write, e.g. when the disk is nearly full.
+    """
+    fd = _get_record_fd()
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _close_record_fd() -> None:
+    """Flush the booking records file to disk and close it"""
+    global _record_fd
+    fd, _record_fd = _record_fd, None
+    if fd is not None:
+        os.fsync(fd)
+        os.close(fd)
 
 
 def save_booking_record_simple(booking_data: Dict):
@@ -486,15 +731,13 @@ def save_booking_record_simple(booking_data: Dict):
         # Build record using only original booking_data
         record = {
             "booking_data": booking_data,  # Original collected data
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.now(_UTC).isoformat(),
         }
 
-        # Save to file
-        filename = "booking_records.jsonl"
-        with open(filename, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Save to file as one fully encoded line
+        _write_record(jsonutil.dumps(record, append_newline=True))
 
-        console.print(f"[dim]Booking record saved to {filename}[/dim]")
+        console.print(f"[dim]Booking record saved to {RECORDS_FILENAME}[/dim]")
         console.print("\n[bold blue]Booking process completed![/bold blue]")
         console.print(
             "Our customer service team will contact you within 24 hours to confirm specific arrangements."